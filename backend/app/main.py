@@ -3,21 +3,28 @@ FastAPI application entry point.
 Configures the main application instance with middleware, routers, and lifecycle events.
 """
 
+import asyncio
+import os
+import time
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+import orjson
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 import structlog
 import redis.asyncio as redis
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlmodel import delete, select
 
 from app.settings import get_settings
-from app.database import init_db
+from app.database import get_session, init_db
+from app.models.events import DDoSEvent
 from app.routers import health, events, admin
 from app.utils.logging import setup_logging
+from app.utils.ratelimit import limiter
 from app.services.websocket import WebSocketManager
 
 # Configure structured logging
@@ -27,26 +34,59 @@ logger = structlog.get_logger(__name__)
 # Initialize settings
 settings = get_settings()
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 # Global instances
 redis_client = None
-scheduler = None
 websocket_manager = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
-    global redis_client, scheduler, websocket_manager
+    global redis_client, websocket_manager
     
     logger.info("Starting DDoS Attack Map application")
-    
+
+    app.state.settings = settings
+
+    # Pre-serialize bodies that only depend on settings, so the version and
+    # root endpoints return a byte copy instead of re-encoding per request.
+    app.state.version_bytes = orjson.dumps({
+        "version": "1.0.0",
+        "build_date": os.environ.get("BUILD_DATE", "2025-01-01T00:00:00Z"),
+        "commit_hash": os.environ.get("GIT_SHA", "dev"),
+        "environment": "development" if settings.debug else "production",
+        "features": {
+            "abuseipdb_enabled": settings.enable_abuseipdb,
+            "real_data_enabled": settings.enable_real_radar_data,
+            "mock_events": settings.mock_event_generation,
+        },
+    })
+    app.state.root_bytes = orjson.dumps({
+        "service": "DDoS Attack Map",
+        "status": "operational",
+        "version": "1.0.0",
+        "endpoints": {
+            "health": "/api/v1/health",
+            "events": "/api/v1/events",
+            "docs": "/docs" if settings.debug else "disabled",
+        },
+    })
+
     try:
-        # Initialize Redis connection
-        redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        # Initialize Redis connection over a bounded shared pool; keepalive
+        # plus periodic health checks avoid handing out stale sockets after
+        # idle periods.
+        redis_pool = redis.ConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_pool_size,
+            decode_responses=True,
+            socket_keepalive=True,
+            health_check_interval=30,
+        )
+        redis_client = redis.Redis(connection_pool=redis_pool)
         await redis_client.ping()
+        app.state.redis = redis_client
+        app.state.redis_pool = redis_pool
         logger.info("Redis connection established")
         
         # Initialize database
@@ -57,25 +97,41 @@ async def lifespan(app: FastAPI):
         websocket_manager = WebSocketManager(redis_client)
         app.state.websocket_manager = websocket_manager
         
-        # Initialize and start scheduler
-        scheduler = AsyncIOScheduler()
-        await setup_background_tasks(scheduler, redis_client)
-        scheduler.start()
-        logger.info("Background scheduler started")
-        
+        # Cap simultaneous in-flight background jobs so a slow database
+        # cannot pile up unbounded concurrent writes.
+        bg_sem = asyncio.Semaphore(settings.max_concurrent_bg_tasks)
+        app.state.bg_sem = bg_sem
+
+        # Start periodic background tasks
+        await setup_background_tasks(app, redis_client, bg_sem)
+
+        # Cache a once-per-second timestamp so probe responses do not
+        # allocate a fresh datetime per request.
+        app.state.now_iso = _utc_now_iso()
+        app.state.bg_tasks.append(asyncio.create_task(_tick_clock(app)))
+        logger.info("Background tasks started")
+
         yield
-        
+
     except Exception as e:
         logger.error("Failed to initialize application", error=str(e))
         raise
     finally:
         # Cleanup
-        if scheduler and scheduler.running:
-            scheduler.shutdown()
-            logger.info("Scheduler stopped")
-        
+        bg_tasks = getattr(app.state, "bg_tasks", [])
+        for task in bg_tasks:
+            task.cancel()
+        if bg_tasks:
+            await asyncio.gather(*bg_tasks, return_exceptions=True)
+            logger.info("Background tasks stopped")
+
         if redis_client:
             await redis_client.close()
+            # The client does not own an explicitly passed pool, so tear
+            # down the pooled sockets ourselves.
+            pool = getattr(app.state, "redis_pool", None)
+            if pool:
+                await pool.disconnect()
             logger.info("Redis connection closed")
         
         logger.info("Application shutdown complete")
@@ -87,6 +143,7 @@ app = FastAPI(
     description="Real-time visualization of global DDoS attack patterns",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
 )
@@ -95,13 +152,22 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# Add CORS middleware
+# Add gzip compression. The 1 KiB floor means the small probe responses
+# pay no compression CPU, while large JSON event payloads shrink several
+# times over the wire; level 5 trades a little ratio for much less CPU.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Add CORS middleware (added last so it runs outermost). Explicit methods
+# and headers let Starlette take its precomputed-header fast path instead
+# of expanding wildcards per request, and max_age lets browsers cache
+# preflight responses for 10 minutes.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
+    max_age=600,
 )
 
 
@@ -109,14 +175,16 @@ app.add_middleware(
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
+    # Formatting a full traceback is expensive and 500s spike exactly when
+    # the service is under pressure; only attach it in debug mode.
     logger.error(
         "Unhandled exception",
         path=request.url.path,
         method=request.method,
         error=str(exc),
-        exc_info=True
+        exc_info=settings.debug
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
@@ -128,87 +196,152 @@ app.include_router(events.router, prefix="/api/v1", tags=["events"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 
-async def setup_background_tasks(scheduler: AsyncIOScheduler, redis_client):
-    """Configure background tasks for data ingestion and processing."""
+def _utc_now_iso() -> str:
+    """Return the current UTC time as an ISO-8601 string."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+async def _tick_clock(app: FastAPI):
+    """Refresh the cached timestamp used by probe responses every second."""
+    while True:
+        app.state.now_iso = _utc_now_iso()
+        await asyncio.sleep(1.0)
+
+
+async def _run_gated(bg_sem: asyncio.Semaphore, fn):
+    """Run a background job body under the shared concurrency gate."""
+    wait_start = time.monotonic()
+    async with bg_sem:
+        waited = time.monotonic() - wait_start
+        if waited > 0.1:
+            logger.warning(
+                "Background job waited on concurrency gate",
+                job=getattr(fn, "__qualname__", str(fn)),
+                waited_seconds=round(waited, 3)
+            )
+        await fn()
+
+
+async def _periodic(fn, interval: float, bg_sem: asyncio.Semaphore):
+    """Run a background job every `interval` seconds until cancelled.
+
+    Runs never overlap: the next sleep starts only after the current run
+    finishes, so a slow run naturally coalesces missed ticks.
+    """
+    while True:
+        try:
+            await _run_gated(bg_sem, fn)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(
+                "Background job failed",
+                job=getattr(fn, "__qualname__", str(fn))
+            )
+        await asyncio.sleep(interval)
+
+
+async def setup_background_tasks(app: FastAPI, redis_client, bg_sem: asyncio.Semaphore):
+    """Start periodic background tasks for data ingestion and processing."""
+    # Imported lazily on purpose: MLService drags in scikit-learn, numpy
+    # and joblib, an import cost better paid once at startup than on every
+    # import of this module.
     from app.services.radar_client import RadarDataFetcher
     from app.services.abuse_client import AbuseIPEnricher
     from app.services.ml_service import MLService
-    
+
     # Initialize services
     radar_fetcher = RadarDataFetcher(redis_client)
     abuse_enricher = AbuseIPEnricher(redis_client)
     ml_service = MLService()
-    
-    # Add radar data fetching job
-    scheduler.add_job(
-        radar_fetcher.fetch_latest_data,
-        'interval',
-        seconds=settings.radar_fetch_interval_seconds,
-        id='fetch_radar_data',
-        replace_existing=True
-    )
-    
-    # Add abuse IP enrichment job (if enabled)
+
+    tasks = [
+        # Radar data fetching task
+        asyncio.create_task(_periodic(
+            radar_fetcher.fetch_latest_data,
+            settings.radar_fetch_interval_seconds,
+            bg_sem
+        )),
+        # Event cleanup task (frequent short batches instead of an hourly
+        # full sweep, keeping individual transactions small)
+        asyncio.create_task(_periodic(cleanup_old_events, 15 * 60, bg_sem)),
+    ]
+
+    # Abuse IP enrichment task (if enabled)
     if settings.enable_abuseipdb:
-        scheduler.add_job(
+        tasks.append(asyncio.create_task(_periodic(
             abuse_enricher.enrich_recent_ips,
-            'interval',
-            seconds=settings.abuseip_enrich_interval_seconds,
-            id='enrich_abuse_ips',
-            replace_existing=True
-        )
-    
-    # Add event cleanup job
-    scheduler.add_job(
-        cleanup_old_events,
-        'interval',
-        hours=1,
-        id='cleanup_events',
-        replace_existing=True
-    )
-    
+            settings.abuseip_enrich_interval_seconds,
+            bg_sem
+        )))
+
+    app.state.bg_tasks = tasks
     logger.info("Background tasks configured")
 
 
+CLEANUP_BATCH_SIZE = 5000
+
+
 async def cleanup_old_events():
-    """Clean up old events from the database."""
-    from app.database import get_session
-    from app.models.events import DDoSEvent
-    from datetime import datetime, timedelta
-    from sqlmodel import delete
-    
-    cutoff_time = datetime.utcnow() - timedelta(hours=settings.event_cleanup_hours)
-    
+    """Clean up old events from the database in bounded batches.
+
+    Deleting in batches with a commit between each keeps transactions
+    short, so the cleanup never holds row locks or bloats the WAL the way
+    a single full-table DELETE would on a high-ingest system.
+    """
+    cutoff_time = datetime.now(timezone.utc) - timedelta(hours=settings.event_cleanup_hours)
+    deleted_total = 0
+
     async with get_session() as session:
-        stmt = delete(DDoSEvent).where(DDoSEvent.created_at < cutoff_time)
-        result = await session.exec(stmt)
-        await session.commit()
-        
-        logger.info("Cleaned up old events", deleted_count=result.rowcount)
+        while True:
+            batch_ids = (
+                select(DDoSEvent.id)
+                .where(DDoSEvent.created_at < cutoff_time)
+                .limit(CLEANUP_BATCH_SIZE)
+            )
+            stmt = (
+                delete(DDoSEvent)
+                .where(DDoSEvent.id.in_(batch_ids))
+                .execution_options(synchronize_session=False)
+            )
+            result = await session.exec(stmt)
+            await session.commit()
+            deleted_total += result.rowcount
+
+            if result.rowcount < CLEANUP_BATCH_SIZE:
+                break
+            # Yield between batches so concurrent writers get the locks back
+            await asyncio.sleep(0.1)
+
+    logger.info("Cleaned up old events", deleted_count=deleted_total)
 
 
 # Health check endpoint at root
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Root endpoint providing basic service information."""
-    return {
-        "service": "DDoS Attack Map",
-        "status": "operational",
-        "version": "1.0.0",
-        "endpoints": {
-            "health": "/api/v1/health",
-            "events": "/api/v1/events",
-            "docs": "/docs" if settings.debug else "disabled",
-        }
-    }
+    return Response(
+        content=request.app.state.root_bytes,
+        media_type="application/json"
+    )
 
 
 if __name__ == "__main__":
     import uvicorn
+
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        # uvloop is unavailable on Windows; fall back to the default loop
+        loop = "auto"
+
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.reload,
-        log_level=settings.log_level.lower()
+        log_level=settings.log_level.lower(),
+        loop=loop,
+        http="httptools"
     )
\ No newline at end of file
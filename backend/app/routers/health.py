@@ -2,74 +2,124 @@
 Health check and version endpoints for monitoring and diagnostics.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
+import asyncio
+
+import orjson
 import redis.asyncio as redis
-from datetime import datetime, timezone
 import structlog
+import time
+
+from sqlalchemy import text
 
-from app.settings import get_settings
-from app.models.responses import HealthResponse, VersionResponse
+from app.settings import Settings, get_settings
 from app.database import get_session
+from app.utils.ratelimit import limiter
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
 logger = structlog.get_logger(__name__)
 
 
-@router.get("/health", response_model=HealthResponse)
+# Probes fire from every replica of every prober, so a successful backend
+# check is reused for a few seconds instead of paying a round-trip per call.
+DB_PROBE_TTL_S = 5
+REDIS_PROBE_TTL_S = 5
+
+_db_probe_cache = {"ts": 0.0, "healthy": False, "err": None}
+_redis_probe_cache = {"ts": 0.0, "healthy": False, "err": None}
+
+
+async def get_redis(request: Request) -> redis.Redis:
+    """Return a Redis client over the shared connection pool.
+
+    Constructing the client is cheap — it is just a view over the pool
+    initialized during application startup.
+    """
+    return redis.Redis(connection_pool=request.app.state.redis_pool)
+
+
+async def _probe_database() -> dict:
+    """Run SELECT 1 against the database, reusing a recent result within TTL."""
+    now = time.monotonic()
+    if now - _db_probe_cache["ts"] < DB_PROBE_TTL_S:
+        return _db_probe_cache
+    try:
+        async with get_session() as session:
+            await session.exec(text("SELECT 1"))
+        _db_probe_cache.update(ts=now, healthy=True, err=None)
+        logger.debug("Database health check passed")
+    except Exception as e:
+        _db_probe_cache.update(ts=now, healthy=False, err=str(e))
+        logger.error("Database health check failed", error=str(e))
+    return _db_probe_cache
+
+
+async def _probe_redis(redis_client: redis.Redis) -> dict:
+    """PING Redis, reusing a recent result within TTL."""
+    now = time.monotonic()
+    if now - _redis_probe_cache["ts"] < REDIS_PROBE_TTL_S:
+        return _redis_probe_cache
+    try:
+        await redis_client.ping()
+        _redis_probe_cache.update(ts=now, healthy=True, err=None)
+        logger.debug("Redis health check passed")
+    except Exception as e:
+        _redis_probe_cache.update(ts=now, healthy=False, err=str(e))
+        logger.error("Redis health check failed", error=str(e))
+    return _redis_probe_cache
+
+
+@router.get("/health")
 @limiter.limit("10/minute")
-async def health_check(request):
+async def health_check(
+    request: Request,
+    redis_client: redis.Redis = Depends(get_redis),
+    settings: Settings = Depends(get_settings),
+):
     """
     Comprehensive health check endpoint.
     Verifies database, Redis, and external service connectivity.
     """
-    settings = get_settings()
     health_data = {
         "status": "healthy",
-        "timestamp": datetime.now(timezone.utc),
+        "timestamp": request.app.state.now_iso,
         "version": "1.0.0",
         "services": {}
     }
     
     overall_healthy = True
     
-    # Check database connectivity
-    try:
-        async with get_session() as session:
-            await session.exec("SELECT 1")
+    # Probe database and Redis concurrently; the checks are independent,
+    # so the wall time is the slower of the two rather than the sum.
+    db_probe, redis_probe = await asyncio.gather(
+        _probe_database(),
+        _probe_redis(redis_client),
+    )
+
+    if db_probe["healthy"]:
         health_data["services"]["database"] = {
             "status": "healthy",
             "response_time_ms": None  # Could add timing if needed
         }
-        logger.debug("Database health check passed")
-    except Exception as e:
+    else:
         health_data["services"]["database"] = {
             "status": "unhealthy",
-            "error": str(e)
+            "error": db_probe["err"]
         }
         overall_healthy = False
-        logger.error("Database health check failed", error=str(e))
-    
-    # Check Redis connectivity
-    try:
-        redis_client = redis.from_url(settings.redis_url, decode_responses=True)
-        await redis_client.ping()
-        await redis_client.close()
+
+    if redis_probe["healthy"]:
         health_data["services"]["redis"] = {
             "status": "healthy"
         }
-        logger.debug("Redis health check passed")
-    except Exception as e:
+    else:
         health_data["services"]["redis"] = {
             "status": "unhealthy",
-            "error": str(e)
+            "error": redis_probe["err"]
         }
         overall_healthy = False
-        logger.error("Redis health check failed", error=str(e))
-    
+
     # Check external API availability (non-blocking)
     health_data["services"]["external_apis"] = {
         "abuseipdb": {
@@ -87,64 +137,60 @@ async def health_check(request):
         health_data["status"] = "degraded"
     
     status_code = 200 if overall_healthy else 503
-    return JSONResponse(content=health_data, status_code=status_code)
+    return ORJSONResponse(content=health_data, status_code=status_code)
 
 
 @router.get("/health/ready")
 @limiter.limit("20/minute")
-async def readiness_probe(request):
+async def readiness_probe(request: Request, redis_client: redis.Redis = Depends(get_redis)):
     """
     Kubernetes-style readiness probe.
     Returns 200 if the service is ready to accept traffic.
     """
-    settings = get_settings()
-    
-    try:
-        # Quick database check
-        async with get_session() as session:
-            await session.exec("SELECT 1")
-        
-        # Quick Redis check
-        redis_client = redis.from_url(settings.redis_url, decode_responses=True)
-        await redis_client.ping()
-        await redis_client.close()
-        
+    db_probe, redis_probe = await asyncio.gather(
+        _probe_database(),
+        _probe_redis(redis_client),
+    )
+
+    if db_probe["healthy"] and redis_probe["healthy"]:
         return {"status": "ready"}
-    except Exception as e:
-        logger.error("Readiness check failed", error=str(e))
-        raise HTTPException(status_code=503, detail="Service not ready")
+
+    logger.error(
+        "Readiness check failed",
+        error=db_probe["err"] or redis_probe["err"]
+    )
+    raise HTTPException(status_code=503, detail="Service not ready")
+
+
+# Liveness is the hottest health path; the body is serialized once so each
+# probe costs a byte copy. The Response itself is built per request —
+# responses are mutable, so a shared instance would leak headers that
+# middleware (e.g. CORS) adds for one caller onto every later caller.
+_LIVE_BYTES = orjson.dumps({"status": "alive"})
 
 
 @router.get("/health/live")
-@limiter.limit("30/minute")
-async def liveness_probe(request):
+@limiter.exempt
+async def liveness_probe():
     """
     Kubernetes-style liveness probe.
     Returns 200 if the application process is running.
     """
-    return {
-        "status": "alive",
-        "timestamp": datetime.now(timezone.utc),
-        "uptime_seconds": None  # Could add process uptime tracking
-    }
+    return Response(
+        content=_LIVE_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
 
 
-@router.get("/version", response_model=VersionResponse)
+@router.get("/version")
 @limiter.limit("30/minute")
-async def get_version(request):
+async def get_version(request: Request):
     """
     Get application version and build information.
+    The body is pre-serialized once at startup; see lifespan in main.py.
     """
-    settings = get_settings()
-    
-    return {
-        "version": "1.0.0",
-        "build_date": "2025-01-01T00:00:00Z",  # Would be injected at build time
-        "commit_hash": "dev",  # Would be injected from git
-        "environment": "development" if settings.debug else "production",
-        "features": {
-            "abuseipdb_enabled": settings.enable_abuseipdb,
-            "real_data_enabled": settings.enable_real_radar_data,
-            "mock_events": settings.mock_event_generation
-        }
-    }
\ No newline at end of file
+    return Response(
+        content=request.app.state.version_bytes,
+        media_type="application/json"
+    )
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Structured logging configuration using structlog.
+Renders JSON log lines through orjson and memoizes bound loggers.
+"""
+
+import logging
+import sys
+
+import orjson
+import structlog
+
+from app.settings import get_settings
+
+
+def _orjson_serializer(value, **kwargs) -> str:
+    """Serialize a log event dict with orjson instead of json.dumps."""
+    return orjson.dumps(value).decode()
+
+
+def setup_logging() -> None:
+    """Configure structlog for the application.
+
+    The JSON renderer is backed by orjson so each record is encoded in C,
+    and cache_logger_on_first_use memoizes the bound logger per name so
+    get_logger() does not rebuild the processor chain on every call.
+    """
+    settings = get_settings()
+    level = getattr(logging, settings.log_level.upper(), logging.INFO)
+
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+        structlog.processors.format_exc_info,
+    ]
+
+    if settings.log_format == "json":
+        processors.append(
+            structlog.processors.JSONRenderer(serializer=_orjson_serializer)
+        )
+    else:
+        processors.append(structlog.dev.ConsoleRenderer())
+
+    structlog.configure(
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        logger_factory=structlog.PrintLoggerFactory(sys.stdout),
+        cache_logger_on_first_use=True,
+    )
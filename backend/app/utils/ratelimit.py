@@ -0,0 +1,17 @@
+"""
+Shared rate limiter instance.
+A single Redis-backed Limiter keeps counters globally consistent across
+Uvicorn workers; the default in-memory storage gives each worker its own
+counters, so a client effectively gets N times the configured limit.
+"""
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.settings import get_settings
+
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=get_settings().redis_url,
+    strategy="moving-window",
+)